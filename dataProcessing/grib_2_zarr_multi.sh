@@ -43,8 +43,7 @@ BASE_DATE="20210421"
 DATE=$(date -d "${BASE_DATE} +${SLURM_ARRAY_TASK_ID} days" +%Y%m%d)
 
 module load python/3.11.6 py-pip/23.1.2-py3.11.6
-module load py-dask/2023.4.1
-echo "Python and dask modules loaded"
+echo "Python modules loaded"
 
 pip install --user -r requirements.txt
 echo "Pip packages installed"
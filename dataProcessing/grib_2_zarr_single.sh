@@ -7,8 +7,8 @@
 #          Runs on Pawsey’s HPC (Setonix) within a Slurm job.
 #
 # Workflow:
-#   1. Load required Python and Dask modules from the environment
-#   2. Install any additional Python packages from requirements.txt (same directory)
+#   1. Load the required Python modules from the environment
+#   2. Install the Python packages (including dask/distributed) from requirements.txt (same directory)
 #   3. Run `process_date.py` for a specified forecast date, converting GRIB2
 #      data in $MYSCRATCH/gfs_sample into Zarr outputs in $MYSCRATCH/zarr_store
 #
@@ -56,8 +56,7 @@
 
 # Load required modules
 module load python/3.11.6 py-pip/23.1.2-py3.11.6
-module load py-dask/2023.4.1
-echo "Python and dask modules loaded"
+echo "Python modules loaded"
 
 # Install additional Python dependencies (user local install)
 pip install --user -r requirements.txt
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 import argparse
-import glob
+import numpy as np
+import dask
+import dask.array as da
+import eccodes
+import numcodecs
 import xarray as xr
+import zarr
 import traceback
+from pathlib import Path
+from dask.distributed import Client, LocalCluster
 
 # -----------------------------------------------------------------------------
 # process_date.py
@@ -22,12 +29,79 @@ import traceback
 #       --input-root /scratch/$USER/gfs_sample \
 #       --output-root /scratch/$USER/zarr_store
 # * Used within `grib_2_zarr_single.sh` and `grib_2_zarr_multi.sh` 
+#
+# Performance notes:
+#   The pipeline is I/O-bound, not compute-bound: the time goes into the GRIB2
+#   metadata scan (cfgrib index + coordinates) when opening ~161 files, and into
+#   compressing/writing the Zarr chunks. Vectorising or moving the arithmetic to
+#   a GPU would not help. Effort is better spent on:
+#       * cfgrib flags: persistent per-file `indexpath`, `cache_geo_coords=True`
+#         (or `--reader eccodes` to skip cfgrib entirely)
+#       * parallel opens/writes on the local Dask cluster (`parallel=True`,
+#         region writes)
+#       * data layout: chunk shape, Blosc-zstd compression, quantized dtypes
+#   Inputs are read from local/Lustre scratch; GRIB2 files hosted on S3 would
+#   instead need fsspec with `cache_type="readahead"` and a block size >= 8 MB.
 # -----------------------------------------------------------------------------
 
 # Vars that arrive as 4D (step, orderedSequenceData, lat, lon)
 # → flattened into multiple 3D fields var_0, var_1, ...
 SEQUENCE_VARS = ("shts", "mpts", "swdir") 
 
+# cfgrib index file written next to each GRIB2 file ({path} is substituted by
+# cfgrib). One index per file, so parallel workers never share an index, and
+# reruns over the same inputs reuse the cached index instead of rescanning
+# every GRIB message.
+INDEXPATH = "{path}.{short_hash}.idx"
+
+# Unused/redundant variables, never read from the GRIB2 files
+DROP_VARS = ("surface", "valid_time")
+
+# Zarr compressor: zstd with bit-shuffle exposes the redundancy in float
+# mantissas, giving better ratios than the default Blosc-lz4 byte shuffle
+# while still decompressing quickly
+COMPRESSOR = numcodecs.Blosc(cname="zstd", clevel=3, shuffle=numcodecs.Blosc.BITSHUFFLE)
+
+# Wave fields stored as int16 with scale_factor=0.01 (0.01 m / 0.01 s
+# resolution, up to ~327 m / s): significant heights and periods
+QUANTIZE_INT16 = ("swh", "shww", "shts", "perpw", "mpww", "mpts")
+# Wave directions (0-360°) stored as float16
+QUANTIZE_FLOAT16 = ("dirpw", "wvdir", "swdir")
+
+# Spatial window kept from each file (inclusive bounds, in degrees)
+LAT_RANGE = (-70, 0)
+LON_RANGE = (-60, 135)
+
+def _index_slice(values: np.ndarray, lo: float, hi: float) -> slice:
+    """Integer slice selecting `lo <= values <= hi` in ascending order.
+
+    Equivalent to label-based `sel(dim=slice(lo, hi))` on an ascending
+    coordinate, but computed once with `np.searchsorted`. For a descending
+    coordinate the returned slice has a negative step, so it flips the axis
+    and trims it in a single indexing operation.
+
+    Args:
+        values (np.ndarray): 1D monotonic coordinate values.
+        lo (float): Lower bound (inclusive).
+        hi (float): Upper bound (inclusive).
+
+    Returns:
+        slice: Positional slice to use with `isel`.
+    """
+    if values.size < 2 or values[0] <= values[-1]:  # Already ascending
+        start = int(np.searchsorted(values, lo, side="left"))
+        stop = int(np.searchsorted(values, hi, side="right"))
+        return slice(start, stop)
+
+    # Descending: search the reversed view, then map back to original positions
+    n = values.size
+    start = int(np.searchsorted(values[::-1], lo, side="left"))
+    stop = int(np.searchsorted(values[::-1], hi, side="right"))
+    if start >= stop:  # Empty selection
+        return slice(0, 0)
+    end = n - 1 - stop  # Exclusive end when walking backwards
+    return slice(n - 1 - start, end if end >= 0 else None, -1)
+
 def preprocess_slice_flip(ds: xr.Dataset) -> xr.Dataset:
     """Ensure ascending latitude order, then trim to region.
 
@@ -38,6 +112,9 @@ def preprocess_slice_flip(ds: xr.Dataset) -> xr.Dataset:
       * Latitude: -70 → 0
       * Longitude: -60 → 135
 
+    The flip and trim are done with a single positional `isel`, with the
+    integer bounds computed from the 1D coordinate arrays.
+
     Args:
         ds (xr.Dataset): Dataset from a single GRIB2 file.
 
@@ -45,11 +122,12 @@ def preprocess_slice_flip(ds: xr.Dataset) -> xr.Dataset:
         xr.Dataset: The dataset trimmed to the specified lat/lon region,
         with latitude in ascending order.
     """
-    ds = ds.isel(latitude=slice(None, None, -1))  # Order latitude from South to North (works with matplitlob.pyplot visualization)
-
-    # Slice the gridded region based on coordinate values
-    ds = ds.sel(latitude=slice(-70, 0), longitude=slice(-60, 135))
-    return ds
+    # Order latitude from South to North (works with matplitlob.pyplot visualization)
+    # and slice the gridded region based on coordinate values
+    return ds.isel(
+        latitude=_index_slice(ds["latitude"].values, *LAT_RANGE),
+        longitude=_index_slice(ds["longitude"].values, *LON_RANGE),
+    )
 
 def flatten_sequence_vars(ds: xr.Dataset, vars_to_flatten=SEQUENCE_VARS) -> xr.Dataset:
     """Flatten sequence-type variables by expanding the `orderedSequenceData` dimension.
@@ -77,23 +155,361 @@ def flatten_sequence_vars(ds: xr.Dataset, vars_to_flatten=SEQUENCE_VARS) -> xr.D
     if ordered_seq_dim not in ds.dims:  # No orderedSequenceData field found
         return ds
 
-    out = ds
-    n = out.sizes[ordered_seq_dim]  # Get the size of the orderedSequenceData dim (3)
+    n = ds.sizes[ordered_seq_dim]  # Get the size of the orderedSequenceData dim (3)
 
-    for var in vars_to_flatten:  # Loop through variables to flatten
-        if var in out and ordered_seq_dim in out[var].dims:  # Variable is present and uses orderedSequenceData
+    new_vars = {}  # Final data variables; the output Dataset is built once from these
+    for name, var in ds.data_vars.items():
+        if name in vars_to_flatten and ordered_seq_dim in var.dims:  # Variable uses orderedSequenceData
+            arr = var.variable.transpose(ordered_seq_dim, ...)  # Sequence dim first on the underlying array
             for i in range(n):  # Iterate through dimension length (3)
-                out[f"{var}_{i}"] = out[var].isel(orderedSequenceData=i)   # Create new filed var_i equal to the orderedSequenceData=i
-            out = out.drop_vars(var)  # Remove the variable
+                # New field var_i equal to orderedSequenceData=i (plain array indexing, no xarray indexer per slice)
+                new_vars[f"{name}_{i}"] = xr.Variable(arr.dims[1:], arr.data[i], attrs=arr.attrs)
+        else:
+            new_vars[name] = var.variable
+
+    # Drop the orderedSequenceData coordinate, and anything else on that dim if no variable uses it
+    still_uses = any(ordered_seq_dim in v.dims for v in new_vars.values())
+    coords = {
+        k: c.variable
+        for k, c in ds.coords.items()
+        if k != ordered_seq_dim and (still_uses or ordered_seq_dim not in c.dims)
+    }
+    return xr.Dataset(new_vars, coords=coords, attrs=ds.attrs)
+
+def preprocess_file(ds: xr.Dataset) -> xr.Dataset:
+    """Per-file preprocessing passed to `open_mfdataset`.
+
+    Trims/flips the spatial window with `preprocess_slice_flip`, then
+    flattens the sequence-type variables with `flatten_sequence_vars`.
+    Running both per file keeps the work on the Dask workers (in parallel)
+    and means the concatenated dataset only ever holds 3D variables.
+
+    Args:
+        ds (xr.Dataset): Dataset from a single GRIB2 file.
+
+    Returns:
+        xr.Dataset: The trimmed dataset with sequence variables flattened.
+    """
+    return flatten_sequence_vars(preprocess_slice_flip(ds), SEQUENCE_VARS)
+
+def zarr_chunks(
+    ds: xr.Dataset,
+    chunk_step: int,
+    chunk_lat: int | None = None,
+    chunk_lon: int | None = None
+) -> dict:
+    """Chunk sizes shared by the Dask arrays and the Zarr store.
+
+    Each chunk covers `chunk_step` forecast steps and either the full lat/lon
+    window (default) or a `chunk_lat` × `chunk_lon` spatial tile. Sizes are
+    capped at the dimension length.
+
+    Args:
+        ds (xr.Dataset): Dataset to be written, with dims
+            (step, latitude, longitude).
+        chunk_step (int): Chunk size along the `step` dimension.
+        chunk_lat (int, optional): Chunk size along `latitude`. Defaults to
+            `None` (full extent).
+        chunk_lon (int, optional): Chunk size along `longitude`. Defaults to
+            `None` (full extent).
+
+    Returns:
+        dict: Mapping of dimension name → chunk size.
+    """
+    return {
+        "step": min(chunk_step, ds.sizes["step"]),
+        "latitude": min(chunk_lat or ds.sizes["latitude"], ds.sizes["latitude"]),
+        "longitude": min(chunk_lon or ds.sizes["longitude"], ds.sizes["longitude"]),
+    }
+
+def _base_name(var: str) -> str:
+    """Name of a variable before sequence flattening (e.g. `shts_1` → `shts`)."""
+    base, _, suffix = var.rpartition("_")
+    return base if base in SEQUENCE_VARS and suffix.isdigit() else var
+
+def zarr_encoding(ds: xr.Dataset, chunks: dict, quantize: bool = True) -> dict:
+    """Per-variable Zarr encoding: chunks matching the Dask chunks + compressor.
+
+    Used together with `ds.chunk(chunks)`, so each Dask chunk is exactly
+    one Zarr chunk and every Dask task writes whole Zarr chunks (no
+    read-modify-write between writers). All variables use `COMPRESSOR`
+    (via the zarr>=3 `compressors` key, written as the v2 `compressor`).
+
+    With `quantize`, wave heights/periods (`QUANTIZE_INT16`) are stored as
+    int16 with `scale_factor=0.01` and wave directions (`QUANTIZE_FLOAT16`)
+    as float16. This is lossy. xarray applies the scaling automatically when
+    reading: the int16 fields decode as float64 and the float16 fields as
+    float32 (the unquantized fields stay float32).
+
+    Args:
+        ds (xr.Dataset): Dataset to be written.
+        chunks (dict): Mapping of dimension name → chunk size, from
+            `zarr_chunks`.
+        quantize (bool, optional): Store the wave variables at reduced
+            precision. Defaults to `True`.
+
+    Returns:
+        dict: Mapping of data variable name → encoding dict for `to_zarr`.
+    """
+    encoding = {}
+    for v in ds.data_vars:
+        encoding[v] = {
+            "chunks": tuple(chunks[d] for d in ds[v].dims),
+            "compressors": (COMPRESSOR,),  # zarr>=3 key; also valid for zarr_format=2 stores
+        }
+        if not quantize:
+            continue
+        if _base_name(v) in QUANTIZE_INT16:
+            encoding[v].update(
+                {"dtype": "int16", "scale_factor": 0.01, "_FillValue": -32768}
+            )
+        elif _base_name(v) in QUANTIZE_FLOAT16:
+            encoding[v]["dtype"] = "float16"
+    return encoding
+
+def write_zarr(ds: xr.Dataset, out_path: str, encoding: dict, zarr_format: int = 2):
+    """Write a chunked dataset to Zarr as parallel, independent step regions.
+
+    The store is first initialised (metadata and in-memory coordinates only,
+    `compute=False`), then each Dask chunk along `step` is written to its own
+    `region`. All region writes are computed together, so the Dask scheduler
+    runs them concurrently; since the Dask chunks match the Zarr chunks, no
+    two writers touch the same chunk. Chunks containing only the fill value
+    (all-NaN land tiles) are skipped; Zarr returns the fill value for them
+    on read. Metadata is consolidated a single time at the end, so a
+    partially written store is never advertised as complete.
+
+    Args:
+        ds (xr.Dataset): Dataset already chunked with `ds.chunk(chunks)`.
+        out_path (str): Path of the Zarr store (overwritten).
+        encoding (dict): Per-variable encoding, from `zarr_encoding`.
+        zarr_format (int, optional): Zarr format version. Defaults to `2`.
+
+    Returns:
+        None: Writes the Zarr store to disk.
+    """
+    # Create the store: array metadata + coordinates, no data chunks yet
+    ds.to_zarr(
+        out_path,
+        mode="w",
+        compute=False,
+        consolidated=False,  # Consolidated once, after all regions are written
+        zarr_format=zarr_format,
+        encoding=encoding,
+    )
+
+    # Region writes may only contain variables along the region dimension
+    data = ds.drop_vars([v for v in ds.variables if "step" not in ds[v].dims])
+    writes = []
+    start = 0
+    for size in ds.chunks["step"]:
+        region = slice(start, start + size)
+        writes.append(
+            data.isel(step=region).to_zarr(
+                out_path,
+                region={"step": region},
+                compute=False,
+                consolidated=False,
+                zarr_format=zarr_format,
+                write_empty_chunks=False,  # All-fill chunks (e.g. land-only tiles) are not stored
+            )
+        )
+        start += size
+    dask.compute(*writes)
+
+    # Single .zmetadata write, only once the store is complete
+    zarr.consolidate_metadata(out_path)
+
+def open_cfgrib(files: list) -> xr.Dataset:
+    """Open one forecast date's GRIB2 files with cfgrib via `open_mfdataset`.
+
+    Files are opened in parallel on the active Dask client, preprocessed per
+    file with `preprocess_file`, and concatenated along `step`. Each file
+    holds a single step, so the result has one Dask chunk per file; the
+    caller rechunks once to the output chunk shape.
 
-    if ordered_seq_dim in out.dims:  # Still a dimension
-        still_uses = any(ordered_seq_dim in out[v].dims for v in out.data_vars)  # Any variables still use the dim
-        if not still_uses:  # No variable uses it
-            out = out.drop_dims(ordered_seq_dim)  # Drop dimension
-    if ordered_seq_dim in out.variables:  # Removes it if its a coordinate
-        out = out.drop_vars(ordered_seq_dim)
+    Args:
+        files (list): GRIB2 file paths, in forecast-step order.
+
+    Returns:
+        xr.Dataset: Lazily loaded dataset with dims (step, latitude, longitude).
+    """
+    # Open and concatenate along forecast step; apply spatial trim + lat flip
+    # and flatten sequence-type variables (e.g., swdir → swdir_0, swdir_1, …) per file
+    return xr.open_mfdataset(
+        files,
+        engine="cfgrib",
+        backend_kwargs={
+            "indexpath": INDEXPATH,
+            "cache_geo_coords": True,  # All files share one lat/lon grid; build it once per grid
+        },
+        combine="nested",
+        concat_dim="step",
+        drop_variables=DROP_VARS,  # Drop unused variables at open, before concat
+        preprocess=preprocess_file,  # Preprocessing applied here
+        parallel=True,  # Open (index build + metadata scan) each file on the Dask workers
+        chunks={},  # Lazy Dask arrays, one chunk per file (step is scalar in each file)
+        join="override",  # Every file shares the same trimmed grid: skip index alignment
+        compat="override",  # Forecast is consistent, minimal safety checks
+        coords="minimal",  # Only concatenate variables along step: no comparisons between files
+        data_vars="minimal",
+        decode_timedelta=False
+    )
+
+def _grib_var_name(gid) -> str:
+    """Output variable name for a GRIB message (sequence vars get `_<i>`).
+
+    Follows cfgrib's naming: `cfVarName`, falling back to `shortName` and
+    then `paramId` when the name is unknown.
+    """
+    name = eccodes.codes_get(gid, "cfVarName")
+    if name in ("undef", "unknown"):
+        name = eccodes.codes_get(gid, "shortName")
+    if name in ("undef", "unknown"):
+        name = str(eccodes.codes_get(gid, "paramId"))
+    if name in SEQUENCE_VARS:  # orderedSequenceData level 1, 2, 3 → _0, _1, _2
+        name = f"{name}_{eccodes.codes_get(gid, 'level') - 1}"
+    return name
+
+def read_grib_header(path: str) -> dict:
+    """Grid, forecast step/time and variable attributes of one GRIB2 file.
+
+    Args:
+        path (str): GRIB2 file path.
+
+    Returns:
+        dict: With keys `latitude`, `longitude` (1D arrays in file order),
+        `step` (hours), `time` (forecast reference time) and `attrs`
+        (variable name → attribute dict).
+    """
+    header = {"attrs": {}}
+    with open(path, "rb") as f:
+        while (gid := eccodes.codes_grib_new_from_file(f)) is not None:
+            try:
+                if "step" not in header:  # Grid and times are shared by all messages
+                    date = str(eccodes.codes_get(gid, "dataDate"))
+                    hhmm = f"{eccodes.codes_get(gid, 'dataTime'):04d}"
+                    header["latitude"] = eccodes.codes_get_array(gid, "distinctLatitudes")
+                    header["longitude"] = eccodes.codes_get_array(gid, "distinctLongitudes")
+                    header["step"] = float(eccodes.codes_get(gid, "step"))
+                    header["time"] = np.datetime64(
+                        f"{date[:4]}-{date[4:6]}-{date[6:]}T{hhmm[:2]}:{hhmm[2:]}", "ns"
+                    )
+                header["attrs"][_grib_var_name(gid)] = {
+                    "long_name": eccodes.codes_get(gid, "name"),
+                    "units": eccodes.codes_get(gid, "units"),
+                    "GRIB_shortName": eccodes.codes_get(gid, "shortName"),
+                }
+            finally:
+                eccodes.codes_release(gid)
+    if "step" not in header:
+        raise ValueError(f"No GRIB messages found in {path} (empty or truncated file)")
+    return header
 
-    return out
+def read_grib_step(path: str) -> float:
+    """Forecast step (hours) of one GRIB2 file, read from its first message.
+
+    Only the message header keys are read; the field values are not decoded.
+
+    Raises:
+        ValueError: If the file contains no GRIB messages.
+    """
+    with open(path, "rb") as f:
+        gid = eccodes.codes_grib_new_from_file(f)
+        if gid is None:
+            raise ValueError(f"No GRIB messages found in {path} (empty or truncated file)")
+        try:
+            return float(eccodes.codes_get(gid, "step"))
+        finally:
+            eccodes.codes_release(gid)
+
+def load_one(path: str, lat_slice: slice, lon_slice: slice, names: tuple) -> dict:
+    """Decode every message of one GRIB2 file into trimmed 2D arrays.
+
+    Reads the values directly with ecCodes (no cfgrib index or xarray
+    dataset construction), reshapes them to (latitude, longitude) in file
+    order and applies the precomputed positional lat/lon slices.
+
+    Args:
+        path (str): GRIB2 file path.
+        lat_slice (slice): Positional latitude slice (from `_index_slice`).
+        lon_slice (slice): Positional longitude slice (from `_index_slice`).
+        names (tuple): Variable names expected in the file (from the first
+            file of the date).
+
+    Returns:
+        dict: Mapping of variable name → float32 array (latitude, longitude),
+        with missing points as NaN.
+
+    Raises:
+        ValueError: If any of `names` is missing from the file.
+    """
+    fields = {}
+    with open(path, "rb") as f:
+        while (gid := eccodes.codes_grib_new_from_file(f)) is not None:
+            try:
+                ni = eccodes.codes_get(gid, "Ni")
+                nj = eccodes.codes_get(gid, "Nj")
+                values = eccodes.codes_get_values(gid).reshape(nj, ni)
+                if eccodes.codes_get(gid, "bitmapPresent"):
+                    values[values == eccodes.codes_get(gid, "missingValue")] = np.nan
+                fields[_grib_var_name(gid)] = values[lat_slice, lon_slice].astype(np.float32)
+            finally:
+                eccodes.codes_release(gid)
+    missing = [n for n in names if n not in fields]
+    if missing:
+        raise ValueError(f"{path} is missing variables {missing} found in the first file of the date")
+    return fields
+
+def open_eccodes(files: list) -> xr.Dataset:
+    """Open one forecast date's GRIB2 files by decoding them with ecCodes.
+
+    Faster alternative to `open_cfgrib` for the known GFS wave layout (one
+    step per file, same grid and variables in every file). The grid,
+    variable names and attributes come from the first file, and the `step`
+    coordinate from a header-only read of each file. Each file is then
+    decoded lazily by one `dask.delayed(load_one)` task, and the results are
+    stacked into per-variable Dask arrays along `step`, so fields are only
+    decoded when their Zarr region is written.
+
+    It is built to give the same output as `open_cfgrib`: cfgrib variable
+    names, step in hours, trimmed region with ascending latitude, missing
+    points as NaN, flattened sequence variables. It carries fewer GRIB
+    attributes. It has not yet been compared against `open_cfgrib` on real
+    GFS wave files, so check one date against the default reader (e.g.
+    `xr.testing.assert_allclose` on the two stores) before relying on it.
+
+    Args:
+        files (list): GRIB2 file paths, in forecast-step order.
+
+    Returns:
+        xr.Dataset: Lazily loaded dataset with dims (step, latitude, longitude).
+    """
+    first = read_grib_header(files[0])
+    lat_slice = _index_slice(first["latitude"], *LAT_RANGE)
+    lon_slice = _index_slice(first["longitude"], *LON_RANGE)
+    lat = first["latitude"][lat_slice]
+    lon = first["longitude"][lon_slice]
+    names = tuple(first["attrs"])
+
+    steps = dask.compute(*[dask.delayed(read_grib_step)(f) for f in files])
+    loaded = [dask.delayed(load_one)(f, lat_slice, lon_slice, names) for f in files]
+
+    data_vars = {}
+    for name, attrs in first["attrs"].items():
+        layers = [
+            da.from_delayed(d[name], shape=(lat.size, lon.size), dtype=np.float32)
+            for d in loaded
+        ]
+        data_vars[name] = (("step", "latitude", "longitude"), da.stack(layers), attrs)
+
+    coords = {
+        "time": ((), first["time"], {"standard_name": "forecast_reference_time", "long_name": "initial time of forecast"}),
+        "step": ("step", list(steps), {"standard_name": "forecast_period", "long_name": "time since forecast_reference_time", "units": "hours"}),
+        "latitude": ("latitude", lat, {"units": "degrees_north", "standard_name": "latitude", "long_name": "latitude"}),
+        "longitude": ("longitude", lon, {"units": "degrees_east", "standard_name": "longitude", "long_name": "longitude"}),
+    }
+    return xr.Dataset(data_vars, coords=coords, attrs={"Conventions": "CF-1.7"})
 
 def process_one_date(
     date: str,
@@ -101,14 +517,20 @@ def process_one_date(
     output_root: str,
     file_pattern: str = "gfs.{date}/00/wave/gridded/*.grib2",
     chunk_step: int = 81,
-    zarr_format: int = 2
+    zarr_format: int = 2,
+    chunk_lat: int | None = None,
+    chunk_lon: int | None = None,
+    quantize: bool = True,
+    reader: str = "cfgrib",
+    n_workers: int | None = None,
+    threads_per_worker: int | None = None
 ):
     """Combine, preprocess, and write one forecast date to Zarr.
 
     Finds all GRIB2 files for a single forecast date, opens them as a single
-    xarray Dataset (concatenated along `step`), applies spatial trimming and
-    latitude orientation fixes, removes redundant variables, flattens
-    sequence-type variables, and writes the result to a Zarr format.
+    xarray Dataset (concatenated along `step`), applies spatial trimming,
+    latitude orientation fixes and sequence-variable flattening per file,
+    removes redundant variables, and writes the result to a Zarr format.
 
     Args:
       date (str): Forecast date in `YYYYMMDD` format (e.g., `"20210414"`).
@@ -119,11 +541,30 @@ def process_one_date(
       file_pattern (str, optional): Glob pattern (relative to `input_root`)
         that locates the date's GRIB2 files. Defaults to
         `"gfs.{date}/00/wave/gridded/*.grib2"`.
-      chunk_step (int, optional): Dask chunk size along the `step` dimension.
+      chunk_step (int, optional): Dask and Zarr chunk size along the `step` dimension.
         Defaults to `81` (roughly splits 0-240h into two large time chunks:
         0-120 and 123-240).
       zarr_format (int, optional): Zarr format version. Only `2` is supported
         here. Defaults to `2`.
+      chunk_lat (int, optional): Chunk size along `latitude`. Defaults to
+        `None` (full extent: one chunk per time block, e.g. `0.0.0` holds
+        hours 0-120 for the whole region, which the rclone filters rely on).
+        Use e.g. `256` for workloads that read small spatial windows.
+      chunk_lon (int, optional): Chunk size along `longitude`. Defaults to
+        `None` (full extent).
+      quantize (bool, optional): Store wave heights/periods as scaled int16
+        and wave directions as float16 (lossy, see `zarr_encoding`).
+        Defaults to `True`.
+      reader (str, optional): How the GRIB2 files are opened: `"cfgrib"`
+        (`open_cfgrib`, via xarray/cfgrib) or `"eccodes"` (`open_eccodes`,
+        direct ecCodes decode for the known GFS wave layout). Defaults to
+        `"cfgrib"`.
+      n_workers (int, optional): Number of Dask worker processes used to open
+        the GRIB2 files and write the Zarr store. Defaults to `None`: a single
+        threaded worker inside this process (no extra processes, so memory
+        use stays close to a plain run on small Slurm allocations).
+      threads_per_worker (int, optional): Threads per Dask worker. Defaults to
+        `None` (Dask picks based on the available CPUs).
 
     Raises:
       FileNotFoundError: If no GRIB2 files are found for the given ``date`` and
@@ -134,39 +575,38 @@ def process_one_date(
     """
     # Locate input files for this date
     pattern = f"{input_root}/{file_pattern.format(date=date)}"
-    files = sorted(glob.glob(pattern))
+    # Sorted by file name (e.g. ...f000.grib2, ...f001.grib2): the zero-padded
+    # forecast hour gives the step order without comparing full paths
+    files = [
+        str(p)
+        for p in sorted(Path(input_root).glob(file_pattern.format(date=date)), key=lambda p: p.name)
+    ]
     if not files:
         raise FileNotFoundError(f"No GRIB2 files for date={date} with pattern={pattern}")
 
-    # Open and concatenate along forecast step; apply spatial trim + lat flip per file
-    ds = xr.open_mfdataset(
-        files,
-        engine="cfgrib",
-        backend_kwargs={"indexpath": ""},
-        combine="nested",
-        concat_dim="step",
-        preprocess=preprocess_slice_flip,  # Preprocessing applied here
-        parallel=False,  # IO bound so parallel does not help as much here
-        chunks={"step": chunk_step},
-        compat="override",  # Forecast is consistent, minimal safety checks
-        coords="minimal",
-        data_vars="minimal",
-        decode_timedelta=False
-    )
-
-    # Drop unused variables
-    for v in ("surface", "valid_time"):
-        if v in ds:
-            ds = ds.drop_vars(v)
-
-    # Flatten sequence-type variables (e.g., swdir → swdir_0, swdir_1, …)
-    ds = flatten_sequence_vars(ds, SEQUENCE_VARS)
+    # Local Dask cluster: the per-file open + preprocess calls run
+    # concurrently, and the same workers handle the Zarr write.
+    # Without --n-workers, one threaded worker runs in this process; worker
+    # processes are only started when asked for explicitly.
+    # The dashboard is disabled to avoid port clashes between array tasks.
+    with LocalCluster(
+        n_workers=n_workers or 1,
+        threads_per_worker=threads_per_worker,
+        processes=n_workers is not None,
+        dashboard_address=None,
+    ) as cluster, Client(cluster):
+        # Combine all files along step, trimmed/flipped with sequence vars flattened
+        if reader == "eccodes":
+            ds = open_eccodes(files)
+        else:
+            ds = open_cfgrib(files)
 
-    # Write to consolidated Zarr store
-    # This can take a little bit of time if run locally (< 5 min)
-    out_path = f"{output_root}/{date}.zarr"
-    ds = ds.chunk({"step": 81})
-    ds.to_zarr(out_path, mode="w", consolidated=True, zarr_format=zarr_format)
+        # Write to consolidated Zarr store, one parallel region write per step chunk
+        # This can take a little bit of time if run locally (< 5 min)
+        out_path = f"{output_root}/{date}.zarr"
+        chunks = zarr_chunks(ds, chunk_step, chunk_lat, chunk_lon)
+        ds = ds.chunk(chunks)  # Only rechunk: one-step-per-file chunks → Zarr chunk shape
+        write_zarr(ds, out_path, zarr_encoding(ds, chunks, quantize), zarr_format)
     print(f"[{date}] wrote {out_path}", flush=True)
 
 def main():
@@ -177,6 +617,12 @@ def main():
     parser.add_argument("--file-pattern", default="gfs.{date}/00/wave/gridded/*.grib2")
     parser.add_argument("--chunk-step", type=int, default=81)
     parser.add_argument("--zarr-format", type=int, default=2, choices=[2])
+    parser.add_argument("--chunk-lat", type=int, default=None, help="Zarr chunk size along latitude (default: full extent)")
+    parser.add_argument("--chunk-lon", type=int, default=None, help="Zarr chunk size along longitude (default: full extent)")
+    parser.add_argument("--no-quantize", dest="quantize", action="store_false", help="Keep all variables as float32 (default: lossy int16/float16 for wave variables)")
+    parser.add_argument("--reader", default="cfgrib", choices=["cfgrib", "eccodes"], help="GRIB2 reader (default: cfgrib)")
+    parser.add_argument("--n-workers", type=int, default=None, help="Dask worker processes (default: one threaded worker in this process)")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="Threads per Dask worker (default: based on CPUs)")
     args = parser.parse_args()
 
     try:
@@ -187,6 +633,12 @@ def main():
             file_pattern=args.file_pattern,
             chunk_step=args.chunk_step,
             zarr_format=args.zarr_format,
+            chunk_lat=args.chunk_lat,
+            chunk_lon=args.chunk_lon,
+            quantize=args.quantize,
+            reader=args.reader,
+            n_workers=args.n_workers,
+            threads_per_worker=args.threads_per_worker,
         )
         print("=== Finished successfully ===", flush=True)
     except Exception as e: